@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Compute backends - pluggable matmul engines for the Python miners
+Mirrors the C++ ComputeDevice interface: every backend exposes
+matmul(A, B) -> C with A u8 [..., M, K], B i8 [..., K, N], C i32 [..., M, N].
+Engine modules (ttnn, torch, ctypes libraries) are imported only when the
+backend is selected, so CPU-only runs and worker processes start fast.
+"""
+
+import os
+import abc
+import sys
+
+import numpy as np
+
+_M, _K, _N = 16, 50240, 16
+
+
+class ComputeBackend(abc.ABC):
+    """Base class; subclasses implement _matmul on (batch, M, K) x (batch, K, N)"""
+
+    name = "base"
+    exact = True  # False when results may not satisfy valid_math
+
+    def matmul(self, A: np.ndarray, B: np.ndarray) -> np.ndarray:
+        """Batched matmul; leading dimensions of A and B are treated as the batch"""
+        batch_shape = A.shape[:-2]
+        A3 = A.reshape(-1, A.shape[-2], A.shape[-1])
+        B3 = B.reshape(-1, B.shape[-2], B.shape[-1])
+        C = self._matmul(A3, B3)
+        return C.reshape(batch_shape + C.shape[-2:])
+
+    @abc.abstractmethod
+    def _matmul(self, A: np.ndarray, B: np.ndarray) -> np.ndarray:
+        """Multiply (batch, M, K) u8 by (batch, K, N) i8 into (batch, M, N) int32"""
+
+    def close(self):
+        pass
+
+
+class NumpyInt32Backend(ComputeBackend):
+    """Exact int32 matmul through NumPy"""
+
+    name = "numpy-int32"
+
+    def _matmul(self, A, B):
+        return np.matmul(A.astype(np.int32), B.astype(np.int32))
+
+
+class BlockedFloatBackend(ComputeBackend):
+    """
+    Exact matmul on float32 BLAS (sgemm).
+    |a*b| <= 255*128, so a 512-long partial dot product stays below 2^24 and is
+    exact in float32; K is split into such blocks and summed in int64.
+    """
+
+    name = "blocked-float"
+    block = 512
+
+    def _matmul(self, A, B):
+        batch, m, k = A.shape
+        n = B.shape[-1]
+        nb = -(-k // self.block)
+        kp = nb * self.block
+
+        Af = np.zeros((batch, m, kp), dtype=np.float32)
+        Bf = np.zeros((batch, kp, n), dtype=np.float32)
+        Af[:, :, :k] = A
+        Bf[:, :k, :] = B
+
+        # (batch, nb, m, block) x (batch, nb, block, n) -> (batch, nb, m, n)
+        Ab = Af.reshape(batch, m, nb, self.block).transpose(0, 2, 1, 3)
+        Bb = Bf.reshape(batch, nb, self.block, n)
+        partial = np.matmul(Ab, Bb)
+        return partial.astype(np.int64).sum(axis=1).astype(np.int32)
+
+
+class NativeBackend(ComputeBackend):
+    """C++ CpuComputeDevice via ctypes (build target hardhack_compute)"""
+
+    name = "native"
+
+    def __init__(self):
+        import ctypes
+        path = os.environ.get("HARDHACK_NATIVE_LIB") or _find_native_lib()
+        if path is None:
+            raise RuntimeError("libhardhack_compute not found; build it or set HARDHACK_NATIVE_LIB")
+        self._lib = ctypes.CDLL(path)
+        self._lib.hardhack_compute_name.restype = ctypes.c_char_p
+        self._lib.hardhack_matmul_batch.argtypes = [ctypes.c_void_p, ctypes.c_void_p,
+                                                    ctypes.c_void_p, ctypes.c_size_t]
+        self._lib.hardhack_matmul_batch.restype = None
+        self.device_name = self._lib.hardhack_compute_name().decode()
+
+    def _matmul(self, A, B):
+        if A.shape[1:] != (_M, _K) or B.shape[1:] != (_K, _N):
+            raise ValueError(f"native backend is fixed to {_M}x{_K}x{_N}")
+        A = np.ascontiguousarray(A, dtype=np.uint8)
+        B = np.ascontiguousarray(B, dtype=np.int8)
+        C = np.empty((A.shape[0], _M, _N), dtype=np.int32)
+        self._lib.hardhack_matmul_batch(A.ctypes.data, B.ctypes.data, C.ctypes.data, A.shape[0])
+        return C
+
+
+class TTNNBackend(ComputeBackend):
+    """Tenstorrent TTNN float32 matmul (fast, inexact: valid_math may be false)"""
+
+    name = "ttnn"
+    exact = False
+
+    def __init__(self, device_id: int = 0):
+        import ttnn
+        import torch
+        self._ttnn = ttnn
+        self._torch = torch
+        print("Initializing TTNN GPU...", file=sys.stderr)
+        self._device = ttnn.open_device(device_id=device_id)
+        print("TTNN GPU ready", file=sys.stderr)
+
+    def _matmul(self, A, B):
+        ttnn, torch = self._ttnn, self._torch
+        A_tt = ttnn.from_torch(torch.from_numpy(A.astype(np.float32)), device=self._device, layout=ttnn.TILE_LAYOUT)
+        B_tt = ttnn.from_torch(torch.from_numpy(B.astype(np.float32)), device=self._device, layout=ttnn.TILE_LAYOUT)
+        C_tt = ttnn.matmul(A_tt, B_tt)
+        return ttnn.to_torch(C_tt).numpy().astype(np.int32)
+
+    def close(self):
+        if self._device is not None:
+            self._ttnn.close_device(self._device)
+            self._device = None
+
+
+def _find_native_lib():
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ("libhardhack_compute.so", "libhardhack_compute.dylib"):
+        path = os.path.join(here, "build", name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+# Registry: name -> backend class. Classes only import their engine on construction.
+BACKENDS = {
+    NumpyInt32Backend.name: NumpyInt32Backend,
+    BlockedFloatBackend.name: BlockedFloatBackend,
+    NativeBackend.name: NativeBackend,
+    TTNNBackend.name: TTNNBackend,
+}
+
+DEFAULT_BACKEND = NumpyInt32Backend.name
+
+
+def register_backend(cls):
+    """Register a ComputeBackend subclass under cls.name (usable as a decorator)"""
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+def create_backend(name: str = DEFAULT_BACKEND, **kwargs) -> ComputeBackend:
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown compute backend '{name}' (available: {', '.join(BACKENDS)})")
+    return cls(**kwargs)
@@ -3,6 +3,7 @@
 #include <vector>
 #include <cstdint>
 #include <memory>
+#include <atomic>
 #include "compute.h"
 
 struct MiningResult {
@@ -10,22 +11,37 @@ struct MiningResult {
     std::vector<uint8_t> nonce;
     std::vector<uint8_t> solution;
     double duration_ms;
-    uint64_t iterations;
+    uint64_t iterations;        // Exact number of hashes evaluated for this job
+};
+
+// One seed/difficulty to mine; several can run concurrently via mine_many()
+struct MiningJob {
+    std::vector<uint8_t> seed;
+    int difficulty_bits;
+    uint64_t max_iterations;
 };
 
 class Miner {
 public:
     Miner(std::unique_ptr<ComputeDevice> device);
 
-    // Iterates nonces internally for maximum speed
-    MiningResult mine(const std::vector<uint8_t>& base_seed, int difficulty_bits, uint64_t max_iterations);
+    // Iterates nonces internally for maximum speed.
+    // Setting *stop (from another thread or a signal handler) ends the call
+    // after the nonce each thread is on; the flag is owned by the caller.
+    MiningResult mine(const std::vector<uint8_t>& base_seed, int difficulty_bits, uint64_t max_iterations,
+                      const std::atomic<bool>* stop = nullptr);
+
+    // Mines all jobs in one thread pool. Threads claim adaptive nonce chunks
+    // from a per-job atomic cursor and rotate between unfinished jobs.
+    std::vector<MiningResult> mine_many(const std::vector<MiningJob>& jobs,
+                                        const std::atomic<bool>* stop = nullptr);
 
 private:
     std::unique_ptr<ComputeDevice> device_;
 
-    void generate_matrices(const std::vector<uint8_t>& seed, 
-                          std::vector<uint8_t>& A, 
+    void generate_matrices(const std::vector<uint8_t>& seed,
+                          std::vector<uint8_t>& A,
                           std::vector<uint8_t>& B);
-    
+
     bool check_difficulty(const std::vector<uint8_t>& solution, int bits);
 };
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+End-to-end load simulator
+Runs each miner configuration against a fresh local RPC stand-in and reports
+accepted solutions per minute, round-transition overhead and submission latency.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import tempfile
+import math
+import subprocess
+
+from local_rpc_server import StandInChain, start_server, parse_schedule
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (argv builder, extra env builder, found log).  The found log holds one
+# {"op": "put", "id", "ts"} record per solution when it is found: the outbox
+# for the Python miners, mine.sh's FOUND_LOG for the C++ miner.
+MINER_CONFIGS = {
+    "openblas": (
+        lambda url, work: [sys.executable, "miner_openblas.py", "--loop", "--rpc-url", url,
+                           "--outbox", os.path.join(work, "outbox.jsonl")],
+        lambda work: {},
+        "outbox.jsonl",
+    ),
+    "blocked-float": (
+        lambda url, work: [sys.executable, "miner_openblas.py", "--loop", "--rpc-url", url,
+                           "--backend", "blocked-float", "--outbox", os.path.join(work, "outbox.jsonl")],
+        lambda work: {},
+        "outbox.jsonl",
+    ),
+    "cpp": (
+        lambda url, work: ["./mine.sh"],
+        lambda work: {"FORCE_DIFF": "", "LOCAL_TEST": "false", "FOUND_LOG": os.path.join(work, "found.jsonl")},
+        "found.jsonl",
+    ),
+}
+
+
+def _percentile(sorted_vals, pct):
+    if not sorted_vals:
+        return None
+    k = (len(sorted_vals) - 1) * pct
+    f = math.floor(k)
+    c = math.ceil(k)
+    if f == c:
+        return sorted_vals[int(k)]
+    d0 = sorted_vals[int(f)] * (c - k)
+    d1 = sorted_vals[int(c)] * (k - f)
+    return d0 + d1
+
+
+def _summary(values):
+    vals = sorted(values)
+    if not vals:
+        return {"count": 0, "mean": None, "p50": None, "p95": None}
+    return {
+        "count": len(vals),
+        "mean": sum(vals) / len(vals),
+        "p50": _percentile(vals, 0.50),
+        "p95": _percentile(vals, 0.95),
+    }
+
+
+def _load_found(path):
+    puts = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if rec.get("op") == "put":
+                    puts[rec["id"]] = rec["ts"]
+    return puts
+
+
+def analyze(chain: StandInChain, t_start: float, t_end: float, found_path: str) -> dict:
+    events = [e for e in chain.snapshot() if t_start <= e["ts"] <= t_end]
+    duration_min = (t_end - t_start) / 60.0
+
+    first_fetch = {}
+    for e in events:
+        if e["kind"] == "seed" and e["round"] not in first_fetch:
+            first_fetch[e["round"]] = e["ts"]
+
+    validates = [e for e in events if e["kind"] == "validate"]
+    # Count each distinct solution once, at its first acceptance
+    accepted, seen = [], set()
+    for e in validates:
+        if e["valid"] and e["sol_id"] not in seen:
+            seen.add(e["sol_id"])
+            accepted.append(e)
+    rejected = {}
+    for e in validates:
+        if not e["valid"]:
+            rejected[e.get("error", "unknown")] = rejected.get(e.get("error", "unknown"), 0) + 1
+
+    # Round transition: rotation -> first fetch of the new seed
+    first_round = chain.round_index(t_start) + 1
+    last_round = chain.round_index(t_end)
+    transition_ms, missed = [], 0
+    for r in range(first_round, last_round + 1):
+        if r in first_fetch:
+            transition_ms.append((first_fetch[r] - chain.round_start(r)) * 1000.0)
+        else:
+            missed += 1
+
+    # Seed fetch -> accepted submission received
+    time_to_submit_ms = [(e["ts"] - first_fetch[e["sol_round"]]) * 1000.0
+                         for e in accepted if e["sol_round"] in first_fetch]
+
+    # Solution found (outbox enqueue / mine.sh FOUND_LOG) -> first receipt by server afterwards
+    puts = _load_found(found_path)
+    received = {}
+    for e in validates:
+        put_ts = puts.get(e.get("sol_id"))
+        if put_ts is not None and e["ts"] >= put_ts and e["sol_id"] not in received:
+            received[e["sol_id"]] = e["ts"]
+    submission_ms = [(received[i] - puts[i]) * 1000.0 for i in received]
+
+    return {
+        "duration_s": t_end - t_start,
+        "accepted": len(accepted),
+        "accepted_per_min": len(accepted) / duration_min if duration_min > 0 else 0,
+        "rejected": rejected,
+        "rounds": {
+            "transitions": last_round - first_round + 1 if last_round >= first_round else 0,
+            "missed": missed,
+            "transition_overhead_ms": _summary(transition_ms),
+        },
+        "time_to_submit_ms": _summary(time_to_submit_ms),
+        "submission_latency_ms": _summary(submission_ms),
+    }
+
+
+def run_config(name: str, args) -> dict:
+    build_argv, build_env, found_name = MINER_CONFIGS[name]
+    chain = StandInChain(args.rotate, parse_schedule(args.difficulty), args.grace_rounds, args.rng_seed,
+                         record_events=True)
+    server, url = start_server(chain, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+
+    with tempfile.TemporaryDirectory(prefix=f"sim_{name}_") as work:
+        env = dict(os.environ, RPC_URL=url, **build_env(work))
+        log_path = os.path.join(work, "miner.log")
+        print(f"[*] {name}: {url} for {args.duration}s (log: {log_path})", file=sys.stderr)
+
+        with open(log_path, "w") as log:
+            t_start = time.time()
+            proc = subprocess.Popen(build_argv(url, work), cwd=REPO_DIR, env=env,
+                                    stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+            try:
+                proc.wait(timeout=args.duration)
+            except subprocess.TimeoutExpired:
+                pass
+            t_end = time.time()
+            if proc.poll() is None:
+                os.killpg(proc.pid, signal.SIGTERM)
+                try:
+                    proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                    proc.wait()
+
+        report = analyze(chain, t_start, t_end, os.path.join(work, found_name))
+        if args.keep_logs:
+            with open(log_path) as f:
+                report["log_tail"] = f.read().splitlines()[-20:]
+
+    server.shutdown()
+    report["exit_code"] = proc.returncode
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HardHack end-to-end load simulator")
+    parser.add_argument("--miners", default="openblas,cpp", help=f"Configurations to run ({','.join(MINER_CONFIGS)})")
+    parser.add_argument("--duration", type=float, default=120.0, help="Seconds per configuration")
+    parser.add_argument("--rotate", type=float, default=30.0, help="Seed rotation interval in seconds")
+    parser.add_argument("--difficulty", default="8", help="Difficulty schedule, comma separated, one per round")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Added RPC latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on latency")
+    parser.add_argument("--grace-rounds", type=int, default=0, help="Accept solutions this many rounds old")
+    parser.add_argument("--rng-seed", type=int, default=None, help="Deterministic stand-in chain")
+    parser.add_argument("--keep-logs", action="store_true", help="Include the tail of each miner log in the report")
+    args = parser.parse_args()
+
+    results = {}
+    for name in [m.strip() for m in args.miners.split(",") if m.strip()]:
+        if name not in MINER_CONFIGS:
+            parser.error(f"unknown miner configuration: {name}")
+        results[name] = run_config(name, args)
+
+    print(json.dumps({
+        "server": {
+            "rotate_s": args.rotate,
+            "difficulty": parse_schedule(args.difficulty),
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+        },
+        "miners": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Local RPC stand-in - mimics the testnet uPoW endpoints for offline testing
+Serves /api/upow/seed, /api/chain/stats and /api/upow/validate/{b58} with real
+difficulty, segment_vr_hash and exact A x B == C (valid_math) checks, plus
+configurable latency, seed rotation and difficulty schedule.
+"""
+
+import sys
+import time
+import json
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from solution_outbox import solution_id
+
+try:
+    import blake3
+    def blake3_hash(data: bytes) -> bytes:
+        return blake3.blake3(data).digest()
+    def blake3_xof(data: bytes, length: int) -> bytes:
+        return blake3.blake3(data).digest(length=length)
+except ImportError:
+    print("Error: blake3 required. Install with: pip3 install blake3", file=sys.stderr)
+    sys.exit(1)
+
+_M, _K, _N = 16, 50240, 16
+_XOF_SIZE = _M * _K + _K * _N
+_SEED_LEN = 240
+_SOLUTION_LEN = _SEED_LEN + _M * _N * 4
+
+
+def leading_zero_bits(hash_bytes: bytes) -> int:
+    hash_int = int.from_bytes(hash_bytes, 'big')
+    if hash_int == 0:
+        return 256
+    return 256 - hash_int.bit_length()
+
+
+def matmul_check(seed: bytes, C: np.ndarray) -> bool:
+    """Exactly verify A x B == C for the matrices derived from seed.
+
+    The stand-in is the test oracle for inexact backends, so it recomputes
+    the product (~80ms) instead of running a probabilistic Freivalds check.
+    """
+    xof_data = blake3_xof(seed, _XOF_SIZE)
+    A = np.frombuffer(xof_data[:_M*_K], dtype=np.uint8).reshape(_M, _K).astype(np.int64)
+    B = np.frombuffer(xof_data[_M*_K:], dtype=np.int8).reshape(_K, _N).astype(np.int64)
+    return np.array_equal(A @ B, C.astype(np.int64))
+
+
+class StandInChain:
+    """
+    Round state for the stand-in server.
+
+    Rounds advance every `rotate_s` seconds; round i uses difficulty
+    schedule[i % len(schedule)]. A solution is accepted once per round;
+    resubmissions are rejected as duplicates. With record_events=True every
+    request is kept in `events` so a simulator can derive throughput and
+    latency figures afterwards.
+    """
+
+    def __init__(self, rotate_s: float = 60.0, schedule=(8,), grace_rounds: int = 0, rng_seed: int = None,
+                 record_events: bool = False):
+        rng = random.Random(rng_seed)
+        self.rotate_s = rotate_s
+        self.schedule = list(schedule)
+        self.grace_rounds = grace_rounds
+        self.pk = rng.randbytes(48)
+        self.pop = rng.randbytes(96)
+        self._salt = rng.randbytes(32)
+        self._lock = threading.Lock()
+        self.start = time.time()
+        self.record_events = record_events
+        self.events = []
+        self._accepted = {}  # round -> set of accepted solution ids
+
+    # --- rounds ------------------------------------------------------------
+
+    def round_index(self, now: float = None) -> int:
+        now = time.time() if now is None else now
+        if self.rotate_s <= 0:
+            return 0
+        return int((now - self.start) // self.rotate_s)
+
+    def round_start(self, idx: int) -> float:
+        return self.start + idx * self.rotate_s
+
+    def difficulty(self, idx: int) -> int:
+        return self.schedule[idx % len(self.schedule)]
+
+    def segment_vr_hash(self, idx: int) -> bytes:
+        return blake3_hash(self._salt + idx.to_bytes(8, 'little'))
+
+    def seed(self, idx: int) -> bytes:
+        """epoch_le(4) || segment_vr_hash(32) || pk(48) || pop(96) || pk(48) || nonce(12)"""
+        epoch = (idx // 10).to_bytes(4, 'little')
+        return epoch + self.segment_vr_hash(idx) + self.pk + self.pop + self.pk + bytes(12)
+
+    def _record(self, kind: str, **fields):
+        if not self.record_events:
+            return
+        with self._lock:
+            self.events.append(dict(kind=kind, ts=time.time(), **fields))
+
+    # --- endpoints ---------------------------------------------------------
+
+    def get_seed(self) -> bytes:
+        idx = self.round_index()
+        self._record("seed", round=idx)
+        return self.seed(idx)
+
+    def get_stats(self) -> dict:
+        idx = self.round_index()
+        self._record("stats", round=idx)
+        return {"stats": {"diff_bits": self.difficulty(idx), "height": idx, "epoch": idx // 10}}
+
+    def validate(self, solution: bytes) -> dict:
+        received = time.time()
+        idx = self.round_index(received)
+        result = {"valid": False, "valid_math": False}
+
+        if len(solution) != _SOLUTION_LEN:
+            result["error"] = f"bad_length:{len(solution)}"
+            self._record("validate", round=idx, sol_round=None, **result)
+            return result
+
+        seed, c_bytes = solution[:_SEED_LEN], solution[_SEED_LEN:]
+        sol_round = None
+        for r in range(idx, max(-1, idx - self.grace_rounds - 16), -1):
+            if seed[4:36] == self.segment_vr_hash(r):
+                sol_round = r
+                break
+
+        sol_id = solution_id(solution)
+        C = np.frombuffer(c_bytes, dtype='<i4').reshape(_M, _N)
+        result["valid_math"] = matmul_check(seed, C)
+        bits = leading_zero_bits(blake3_hash(solution))
+        result["leading_zeros"] = bits
+
+        if sol_round is None:
+            result["error"] = "unknown_segment_vr_hash"
+        elif sol_round < idx - self.grace_rounds:
+            result["error"] = "stale_seed"
+        elif bits < self.difficulty(sol_round):
+            result["error"] = "insufficient_difficulty"
+        elif not result["valid_math"]:
+            result["error"] = "invalid_math"
+        else:
+            with self._lock:
+                # Forget rounds that can no longer accept solutions
+                for r in [r for r in self._accepted if r < idx - self.grace_rounds]:
+                    del self._accepted[r]
+                seen = self._accepted.setdefault(sol_round, set())
+                if sol_id in seen:
+                    result["error"] = "duplicate"
+                else:
+                    seen.add(sol_id)
+                    result["valid"] = True
+
+        self._record("validate", round=idx, sol_round=sol_round, sol_id=sol_id,
+                     **{k: v for k, v in result.items() if k != "leading_zeros"})
+        return result
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return list(self.events)
+
+
+def make_handler(chain: StandInChain, latency_ms: float = 0.0, jitter_ms: float = 0.0):
+    class Handler(BaseHTTPRequestHandler):
+        def _delay(self):
+            delay = latency_ms + (random.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0)
+            if delay > 0:
+                time.sleep(delay / 1000.0)
+
+        def _send(self, code: int, body: bytes, ctype: str):
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._delay()
+            path = self.path.split("?", 1)[0]
+            if path == "/api/upow/seed":
+                self._send(200, chain.get_seed(), "application/octet-stream")
+            elif path == "/api/chain/stats":
+                self._send(200, json.dumps(chain.get_stats()).encode(), "application/json")
+            elif path.startswith("/api/upow/validate/"):
+                import base58
+                try:
+                    solution = base58.b58decode(path[len("/api/upow/validate/"):])
+                except ValueError:
+                    self._send(400, json.dumps({"error": "bad_base58"}).encode(), "application/json")
+                    return
+                self._send(200, json.dumps(chain.validate(solution)).encode(), "application/json")
+            else:
+                self._send(404, json.dumps({"error": "not_found"}).encode(), "application/json")
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def start_server(chain: StandInChain, host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0):
+    """Serve chain in a background thread; returns (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), make_handler(chain, latency_ms, jitter_ms))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="rpc-standin", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def parse_schedule(text: str):
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Amadeus uPoW RPC")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8080, help="Bind port")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on latency")
+    parser.add_argument("--rotate", type=float, default=60.0, help="Seed rotation interval in seconds (0 = never)")
+    parser.add_argument("--difficulty", default="8", help="Difficulty schedule, comma separated, one per round")
+    parser.add_argument("--grace-rounds", type=int, default=0, help="Accept solutions this many rounds old")
+    parser.add_argument("--rng-seed", type=int, default=None, help="Deterministic pk/pop/segment hashes")
+    args = parser.parse_args()
+
+    chain = StandInChain(args.rotate, parse_schedule(args.difficulty), args.grace_rounds, args.rng_seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(chain, args.latency_ms, args.jitter_ms))
+    print(f"[*] Stand-in RPC on http://{args.host}:{args.port} | rotate {args.rotate}s | "
+          f"difficulty {args.difficulty} | latency {args.latency_ms}ms", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped by user", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 #!/bin/bash
 
 # --- AMADEUS RPC CONFIGURATION ---
-RPC_BASE="https://testnet-rpc.ama.one/api/upow"
+RPC_URL=${RPC_URL:-https://testnet-rpc.ama.one}
+RPC_BASE="$RPC_URL/api/upow"
 LOCAL_TEST=${LOCAL_TEST:-false}
+# Difficulty to mine at; set FORCE_DIFF= (empty) to use the chain's diff_bits
+FORCE_DIFF=${FORCE_DIFF-6}
+# Seconds between seed checks while mining; the miner is stopped when the seed rotates
+SEED_POLL=${SEED_POLL:-2}
+# Optional JSONL file; one outbox-style "put" record is appended per found solution
+FOUND_LOG=${FOUND_LOG:-}
 
-MINER_BINARY="./build/hardhack_miner"
+MINER_BINARY="${MINER_BINARY:-./build/hardhack_miner}"
 OUT_FILE="/tmp/miner_result.json"
 
 export OMP_NUM_THREADS="${OMP_NUM_THREADS:-$(nproc 2>/dev/null || echo 4)}"
@@ -27,11 +34,17 @@ while true; do
         SEED_HEX=$(openssl rand -hex 240)
         DIFF=10
     else
-        # 1. Force difficulty to 6 for faster valid_math demonstration
-        DIFF=6
-
-        # 2. Fetch 240 bytes raw seed
+        # 1. Fetch 240 bytes raw seed
         SEED_HEX=$(curl -s "$RPC_BASE/seed" | xxd -p -c 240 | tr -d '\n')
+
+        # 2. Difficulty: forced (default 6 for a fast valid_math demonstration) or from
+        #    chain stats fetched right after the seed, so both belong to the same round
+        if [ -n "$FORCE_DIFF" ]; then
+            DIFF=$FORCE_DIFF
+        else
+            DIFF=$(curl -s "$RPC_URL/api/chain/stats" | grep -o '"diff_bits": *[0-9]*' | grep -o '[0-9]*$')
+            DIFF=${DIFF:-20}
+        fi
     fi
 
     if [ -z "$SEED_HEX" ]; then
@@ -53,8 +66,27 @@ while true; do
     if [ "$TIMEOUT_SEC" -lt 60 ]; then TIMEOUT_SEC=60; fi
     if [ "$TIMEOUT_SEC" -gt 600 ]; then TIMEOUT_SEC=600; fi  # Max 10 minutes
     
-    # 3. Execute High-Speed C++ Miner with timeout
-    timeout $TIMEOUT_SEC $MINER_BINARY --seed "$SEED_HEX" --difficulty "$DIFF" --iterations 0 > "$OUT_FILE" 2>&1
+    # 3. Execute High-Speed C++ Miner with timeout.
+    #    Start from a random nonce so repeated runs on one seed don't re-find the same solution.
+    MINE_SEED="${SEED_HEX:0:456}$(od -An -tx1 -N12 /dev/urandom | tr -d ' \n')"
+    timeout $TIMEOUT_SEC $MINER_BINARY --seed "$MINE_SEED" --difficulty "$DIFF" --iterations 0 > "$OUT_FILE" 2>&1 &
+    MINER_PID=$!
+
+    # Watch for seed rotation; SIGTERM makes the miner stop within one nonce
+    NEXT_POLL=$((SECONDS + SEED_POLL))
+    while [ "$LOCAL_TEST" != "true" ] && kill -0 $MINER_PID 2>/dev/null; do
+        sleep 0.2
+        if [ $SECONDS -ge $NEXT_POLL ]; then
+            NEXT_POLL=$((SECONDS + SEED_POLL))
+            CUR_SEED=$(curl -s "$RPC_BASE/seed" | xxd -p -c 240 | tr -d '\n')
+            if [ -n "$CUR_SEED" ] && [ "$CUR_SEED" != "$SEED_HEX" ]; then
+                echo "[*] Seed rotated, stopping miner"
+                kill -TERM $MINER_PID 2>/dev/null
+                break
+            fi
+        fi
+    done
+    wait $MINER_PID
     TIMEOUT_EXIT=$?
     
     if [ $TIMEOUT_EXIT -eq 124 ]; then
@@ -69,10 +101,17 @@ while true; do
 
     if [ "$FOUND_YES" -gt 0 ]; then
         echo -e "\n[SUCCESS] Found Solution! ($HPS s/s)"
+
+        if [ -n "$FOUND_LOG" ]; then
+            # Same id as solution_outbox.solution_id: sha256(solution)[:16]
+            SOL_HEX=$(grep -o '"solution_hex": "[^"]*"' "$OUT_FILE" | cut -d'"' -f4)
+            SOL_ID=$(echo -n "$SOL_HEX" | xxd -r -p | sha256sum | cut -c1-16)
+            echo "{\"op\": \"put\", \"id\": \"$SOL_ID\", \"ts\": $(date +%s.%N)}" >> "$FOUND_LOG"
+        fi
         
         if [ "$LOCAL_TEST" = "false" ]; then
             echo "[*] Submitting to blockchain..."
-            RESPONSE=$(curl -s "https://testnet-rpc.ama.one/api/upow/validate/$SOL_B58")
+            RESPONSE=$(curl -s "$RPC_BASE/validate/$SOL_B58")
             
             # Parse validation response
             VALID=$(echo "$RESPONSE" | grep -o '"valid":[^,}]*' | cut -d':' -f2 | tr -d ' ')
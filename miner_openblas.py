@@ -13,16 +13,17 @@ import urllib.request
 import json
 import math
 
+# One BLAS thread per process: mining runs cpu_count() worker processes, and the
+# per-nonce matmuls are far too small to benefit from BLAS threading. This must
+# be set before NumPy loads OpenBLAS; workers (fork or spawn) inherit it.
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "GOTO_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
 # Use OpenBLAS via NumPy
 import numpy as np
 
-# Optional GPU path (TTNN float32 - faster but may be inaccurate)
-try:
-    import ttnn
-    import torch
-    _HAS_TTNN = True
-except Exception:
-    _HAS_TTNN = False
+# Matmul engines (numpy-int32, blocked-float, native, ttnn) are imported lazily
+from compute_backends import BACKENDS, DEFAULT_BACKEND, create_backend
 
 # Import blake3
 try:
@@ -36,8 +37,11 @@ except ImportError:
     print("Error: blake3 required. Install with: pip3 install blake3", file=sys.stderr)
     sys.exit(1)
 
-# RPC endpoint
-RPC_URL = "https://testnet-rpc.ama.one"
+from solution_outbox import SolutionOutbox, DEFAULT_OUTBOX_PATH
+import solution_outbox
+
+# RPC endpoint (override with RPC_URL / --rpc-url, e.g. for a local stand-in)
+RPC_URL = os.environ.get("RPC_URL", "https://testnet-rpc.ama.one")
 
 
 def fetch_seed() -> bytes:
@@ -57,11 +61,7 @@ def fetch_difficulty() -> int:
 
 def submit_solution(solution: bytes) -> dict:
     """Submit solution to RPC for validation"""
-    import base58
-    sol_b58 = base58.b58encode(solution).decode()
-    req = urllib.request.Request(f"{RPC_URL}/api/upow/validate/{sol_b58}")
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        return json.loads(resp.read())
+    return solution_outbox.submit_solution(RPC_URL, solution)
 
 
 def seed_to_matrices(seed: bytes):
@@ -101,11 +101,14 @@ _M, _K, _N = 16, 50240, 16
 _XOF_SIZE = _M * _K + _K * _N
 _BASE_SEED = None
 _DIFFICULTY = None
+_BACKEND = None
 
-def _init_worker(seed: bytes, difficulty: int):
-    global _BASE_SEED, _DIFFICULTY
+def _init_worker(seed: bytes, difficulty: int, backend: str = DEFAULT_BACKEND):
+    global _BASE_SEED, _DIFFICULTY, _BACKEND
     _BASE_SEED = seed
     _DIFFICULTY = difficulty
+    if _BACKEND is None or _BACKEND.name != backend:
+        _BACKEND = create_backend(backend)
 
 def _process_nonce(nonce):
     """Process single nonce - must be global for multiprocessing"""
@@ -115,11 +118,11 @@ def _process_nonce(nonce):
     
     # XOF + matrices
     xof_data = blake3_xof(local_seed, _XOF_SIZE)
-    A = np.frombuffer(xof_data[:_M*_K], dtype=np.uint8).reshape(_M, _K).astype(np.int32)
-    B = np.frombuffer(xof_data[_M*_K:], dtype=np.int8).reshape(_K, _N).astype(np.int32)
+    A = np.frombuffer(xof_data[:_M*_K], dtype=np.uint8).reshape(_M, _K)
+    B = np.frombuffer(xof_data[_M*_K:], dtype=np.int8).reshape(_K, _N)
     
-    # OpenBLAS matmul (default, exact)
-    C = np.dot(A, B)
+    # Selected compute backend (numpy-int32 by default, exact)
+    C = _BACKEND.matmul(A, B)
     
     # Solution
     solution = local_seed + C.astype('<i4').tobytes()
@@ -182,16 +185,19 @@ def test_validation(seed: bytes):
     return result
 
 
-def mine_correct(seed: bytes, difficulty: int, max_iterations: int = 10000000):
+def mine_correct(seed: bytes, difficulty: int, max_iterations: int = 10000000, backend: str = DEFAULT_BACKEND,
+                 start_nonce: int = 0):
     """
-    Fast mining with OpenBLAS-accelerated matmul.
+    Fast mining with an exact compute backend (OpenBLAS-accelerated by default).
     Uses multiprocessing for parallel hashing.
+    Scans nonces [start_nonce, start_nonce + max_iterations).
     """
     global _BASE_SEED, _DIFFICULTY
     from concurrent.futures import ProcessPoolExecutor, as_completed
     import multiprocessing
     
-    # Set globals for worker processes via initializer
+    # Set globals for worker processes via initializer (and for the nonce-0 probe below)
+    _init_worker(seed, difficulty, backend)
     
     best_bits = 0
     best_solution = None
@@ -200,51 +206,65 @@ def mine_correct(seed: bytes, difficulty: int, max_iterations: int = 10000000):
     
     # Validate first one to confirm valid_math (GPU path may be invalid)
     import base58
-    nonce, bits, solution = _process_nonce(0)
+    nonce, bits, solution = _process_nonce(start_nonce)
     total_hashes += 1
     best_bits = bits
     best_solution = solution
     
-    sol_b58 = base58.b58encode(solution).decode()
-    req = urllib.request.Request(f"{RPC_URL}/api/upow/validate/{sol_b58}")
-    try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            val_result = json.loads(resp.read())
-        print(f"Validation: {val_result}", file=sys.stderr)
-    except Exception as e:
-        print(f"Validation error: {e}", file=sys.stderr)
+    if start_nonce == 0:
+        sol_b58 = base58.b58encode(solution).decode()
+        req = urllib.request.Request(f"{RPC_URL}/api/upow/validate/{sol_b58}")
+        try:
+            with urllib.request.urlopen(req, timeout=10) as resp:
+                val_result = json.loads(resp.read())
+            print(f"Validation: {val_result}", file=sys.stderr)
+        except Exception as e:
+            print(f"Validation error: {e}", file=sys.stderr)
+
+    if bits >= difficulty:
+        print(f"SOLUTION FOUND! {bits} bits @ nonce {start_nonce}", file=sys.stderr)
+        return {
+            "success": True,
+            "nonce": start_nonce,
+            "leading_zeros": bits,
+            "solution": solution,
+            "hash_rate": 0.0,
+            "total_hashes": total_hashes
+        }
     
     # Parallel mining (reuse pool to avoid heavy respawn costs)
     num_workers = multiprocessing.cpu_count()
     batch_size = num_workers * 50
-    nonce = 1
+    nonce = start_nonce + 1
+    end_nonce = start_nonce + max_iterations
     last_report = start_time
 
-    with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker, initargs=(seed, difficulty)) as executor:
-        while nonce < max_iterations:
-            futures = {executor.submit(_process_nonce, n): n for n in range(nonce, min(nonce + batch_size, max_iterations))}
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker, initargs=(seed, difficulty, backend)) as executor:
+        while nonce < end_nonce:
+            futures = {executor.submit(_process_nonce, n): n for n in range(nonce, min(nonce + batch_size, end_nonce))}
 
             for future in as_completed(futures):
                 n, bits, sol = future.result()
                 total_hashes += 1
 
+                elapsed = time.time() - start_time
+                rate = total_hashes / elapsed if elapsed > 0 else 0
                 if bits > best_bits:
                     best_bits = bits
                     best_solution = sol
-                    elapsed = time.time() - start_time
-                    rate = total_hashes / elapsed if elapsed > 0 else 0
                     print(f"NEW BEST: {bits} bits @ nonce {n}, Rate: {rate:.1f} H/s", file=sys.stderr)
 
-                    if bits >= difficulty:
-                        print(f"SOLUTION FOUND!", file=sys.stderr)
-                        return {
-                            "success": True,
-                            "nonce": n,
-                            "leading_zeros": bits,
-                            "solution": best_solution,
-                            "hash_rate": rate,
-                            "total_hashes": total_hashes
-                        }
+                # A win is judged against the difficulty alone, not the best seen so far
+                if bits >= difficulty:
+                    print(f"SOLUTION FOUND!", file=sys.stderr)
+                    return {
+                        "success": True,
+                        "nonce": n,
+                        "leading_zeros": bits,
+                        "solution": sol,
+                        "hash_rate": rate,
+                        "total_hashes": total_hashes
+                    }
 
             nonce += batch_size
 
@@ -263,31 +283,22 @@ def mine_correct(seed: bytes, difficulty: int, max_iterations: int = 10000000):
     }
 
 
-def mine_gpu_fast(seed: bytes, difficulty: int, max_iterations: int = 10000000):
+def mine_gpu_fast(seed: bytes, difficulty: int, max_iterations: int = 10000000, backend: str = "ttnn",
+                  start_nonce: int = 0):
     """
     GPU-accelerated ultra-fast mode.
-    - Uses TTNN once to compute C (float32, inexact)
+    - Uses the backend (TTNN by default) once to compute C (float32, inexact)
     - Then hashes by modifying nonce only (no XOF per nonce)
     This prioritizes max H/s and ignores valid_math correctness.
+    Scans nonces [start_nonce, start_nonce + max_iterations).
     """
-    if not _HAS_TTNN:
-        raise RuntimeError("TTNN not available for GPU mode")
-
-    print("Initializing TTNN GPU...", file=sys.stderr)
-    device = ttnn.open_device(device_id=0)
-    print("TTNN GPU ready", file=sys.stderr)
+    engine = create_backend(backend)
 
     # Compute C once (inexact)
     xof_data = blake3_xof(seed, _XOF_SIZE)
     A = np.frombuffer(xof_data[:_M*_K], dtype=np.uint8).reshape(_M, _K)
     B = np.frombuffer(xof_data[_M*_K:], dtype=np.int8).reshape(_K, _N)
-    A_t = torch.from_numpy(A.astype(np.float32))
-    B_t = torch.from_numpy(B.astype(np.float32))
-    A_tt = ttnn.from_torch(A_t, device=device, layout=ttnn.TILE_LAYOUT)
-    B_tt = ttnn.from_torch(B_t, device=device, layout=ttnn.TILE_LAYOUT)
-    C_tt = ttnn.matmul(A_tt, B_tt)
-    C_t = ttnn.to_torch(C_tt)
-    C = C_t.numpy().astype(np.int32)
+    C = engine.matmul(A, B)
     C_bytes = C.astype('<i4').tobytes()
 
     best_bits = 0
@@ -299,7 +310,7 @@ def mine_gpu_fast(seed: bytes, difficulty: int, max_iterations: int = 10000000):
     # Print initial rate line so you can see it's running
     print("Hashes: 0, Rate: 0.0 H/s, Best: 0 bits", file=sys.stderr)
 
-    for nonce in range(max_iterations):
+    for nonce in range(start_nonce, start_nonce + max_iterations):
         local_seed = bytearray(seed)
         struct.pack_into('<Q', local_seed, 228, nonce)
         local_seed = bytes(local_seed)
@@ -318,7 +329,7 @@ def mine_gpu_fast(seed: bytes, difficulty: int, max_iterations: int = 10000000):
 
             if bits >= difficulty:
                 print("SOLUTION FOUND!", file=sys.stderr)
-                ttnn.close_device(device)
+                engine.close()
                 return {
                     "success": True,
                     "nonce": nonce,
@@ -335,7 +346,7 @@ def mine_gpu_fast(seed: bytes, difficulty: int, max_iterations: int = 10000000):
             print(f"Hashes: {total_hashes}, Rate: {rate:.1f} H/s, Best: {best_bits} bits", file=sys.stderr)
             last_report = now
 
-    ttnn.close_device(device)
+    engine.close()
     return {
         "success": False,
         "best_bits": best_bits,
@@ -356,7 +367,7 @@ def _percentile(sorted_vals, pct):
     return d0 + d1
 
 
-def _benchmark_once(seed: bytes, nonce: int, use_gpu: bool):
+def _benchmark_once(seed: bytes, nonce: int, backend):
     local_seed = bytearray(seed)
     struct.pack_into('<Q', local_seed, 228, nonce)
     local_seed = bytes(local_seed)
@@ -368,16 +379,7 @@ def _benchmark_once(seed: bytes, nonce: int, use_gpu: bool):
     A = np.frombuffer(xof_data[:_M*_K], dtype=np.uint8).reshape(_M, _K)
     B = np.frombuffer(xof_data[_M*_K:], dtype=np.int8).reshape(_K, _N)
 
-    if use_gpu:
-        A_t = torch.from_numpy(A.astype(np.float32))
-        B_t = torch.from_numpy(B.astype(np.float32))
-        A_tt = ttnn.from_torch(A_t, device=_TTNN_DEVICE, layout=ttnn.TILE_LAYOUT)
-        B_tt = ttnn.from_torch(B_t, device=_TTNN_DEVICE, layout=ttnn.TILE_LAYOUT)
-        C_tt = ttnn.matmul(A_tt, B_tt)
-        C_t = ttnn.to_torch(C_tt)
-        C = C_t.numpy().astype(np.int32)
-    else:
-        C = np.dot(A.astype(np.int32), B.astype(np.int32))
+    C = backend.matmul(A, B)
 
     t2 = time.time()
 
@@ -395,10 +397,10 @@ def _benchmark_once(seed: bytes, nonce: int, use_gpu: bool):
     }
 
 
-def report_benchmarks(seed: bytes, runs: int, use_gpu: bool):
+def report_benchmarks(seed: bytes, runs: int, backend):
     samples = []
     for i in range(runs):
-        samples.append(_benchmark_once(seed, i, use_gpu))
+        samples.append(_benchmark_once(seed, i, backend))
 
     xof_ms = sorted([s["xof_ms"] for s in samples])
     matmul_ms = sorted([s["matmul_ms"] for s in samples])
@@ -417,11 +419,11 @@ def report_benchmarks(seed: bytes, runs: int, use_gpu: bool):
     bytes_moved = (_M * _K) + (_K * _N) + (_M * _N * 4)
     gbps = (bytes_moved / 1e9) / avg_matmul_s if avg_matmul_s > 0 else 0
 
-    # Correctness check (GPU vs CPU)
+    # Correctness check (inexact backend vs exact CPU reference)
     error = None
     determinism = None
-    if use_gpu:
-        cpu_ref = _benchmark_once(seed, 0, False)["C"].astype(np.int64)
+    if not backend.exact:
+        cpu_ref = _benchmark_once(seed, 0, create_backend(DEFAULT_BACKEND))["C"].astype(np.int64)
         gpu_ref = samples[0]["C"].astype(np.int64)
         diff = gpu_ref - cpu_ref
         max_abs = int(np.max(np.abs(diff)))
@@ -433,13 +435,14 @@ def report_benchmarks(seed: bytes, runs: int, use_gpu: bool):
             "rmse": rmse
         }
         # Determinism: run same input twice
-        gpu_ref2 = _benchmark_once(seed, 0, True)["C"]
+        gpu_ref2 = _benchmark_once(seed, 0, backend)["C"]
         determinism = bool(np.array_equal(gpu_ref, gpu_ref2))
     else:
         determinism = True
 
     report = {
-        "mode": "gpu" if use_gpu else "cpu",
+        "mode": "gpu" if not backend.exact else "cpu",
+        "backend": backend.name,
         "runs": runs,
         "latency_ms": {
             "total": {"p50": _percentile(total_ms, 0.50), "p95": _percentile(total_ms, 0.95)},
@@ -469,28 +472,43 @@ def report_benchmarks(seed: bytes, runs: int, use_gpu: bool):
 
 
 def main():
+    global RPC_URL
     parser = argparse.ArgumentParser(description="HardHack OpenBLAS Miner")
     parser.add_argument("--iterations", type=int, default=10000000, help="Max iterations")
     parser.add_argument("--batch-size", type=int, default=10000, help="Batch size for progress updates")
     parser.add_argument("--loop", action="store_true", help="Run continuously")
-    parser.add_argument("--gpu", action="store_true", help="Use TTNN GPU (fast, may be invalid)")
+    parser.add_argument("--gpu", action="store_true", help="Use TTNN GPU (fast, may be invalid); same as --backend ttnn")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=None, help=f"Compute backend (default {DEFAULT_BACKEND})")
     parser.add_argument("--report", action="store_true", help="Output JSON performance report and exit")
     parser.add_argument("--report-runs", type=int, default=20, help="Number of runs for report")
+    parser.add_argument("--rpc-url", default=RPC_URL, help="RPC base URL")
+    parser.add_argument("--outbox", default=DEFAULT_OUTBOX_PATH, help="On-disk queue for found solutions")
+    parser.add_argument("--drain-timeout", type=float, default=60, help="Seconds to wait for pending submissions on exit")
     args = parser.parse_args()
+
+    if args.gpu and args.backend is not None:
+        parser.error("--gpu is shorthand for --backend ttnn; pass only one of them")
+
+    RPC_URL = args.rpc_url.rstrip("/")
+    backend = args.backend or ("ttnn" if args.gpu else DEFAULT_BACKEND)
+    use_gpu = not BACKENDS[backend].exact
+    print(f"Compute backend: {backend}", file=sys.stderr)
     
-    # Check OpenBLAS and tune threading
-    os.environ.setdefault("OMP_NUM_THREADS", str(os.cpu_count() or 1))
-    os.environ.setdefault("OPENBLAS_NUM_THREADS", str(os.cpu_count() or 1))
-    os.environ.setdefault("GOTO_NUM_THREADS", str(os.cpu_count() or 1))
-    os.environ.setdefault("MKL_NUM_THREADS", str(os.cpu_count() or 1))
-    print(f"NumPy config: {np.__config__.show()}", file=sys.stderr)
-    
-    try:
-        import base58
-    except ImportError:
-        print("Installing base58...", file=sys.stderr)
-        os.system("pip3 install base58")
-        import base58
+    if not args.report:
+        try:
+            import base58
+        except ImportError:
+            print("Error: base58 required. Install with: pip3 install base58", file=sys.stderr)
+            sys.exit(1)
+
+    # Found solutions are queued on disk and submitted in the background
+    outbox = None
+    if not args.report:
+        outbox = SolutionOutbox(args.outbox, submit_fn=submit_solution).start()
+
+    # Resume point so --loop does not re-find the same solution for an unchanged seed
+    last_seed = None
+    next_nonce = 0
     
     while True:
         try:
@@ -498,45 +516,43 @@ def main():
             print("Fetching seed...", file=sys.stderr)
             seed = fetch_seed()
             print(f"Seed length: {len(seed)}", file=sys.stderr)
+            if seed != last_seed:
+                last_seed, next_nonce = seed, 0
+            if outbox is not None:
+                outbox.set_round(seed)
             
             difficulty = fetch_difficulty()
             print(f"Difficulty: {difficulty} bits", file=sys.stderr)
             
             # Report mode: run benchmarks and exit
             if args.report:
-                if args.gpu:
-                    if not _HAS_TTNN:
-                        raise RuntimeError("TTNN not available for GPU report mode")
-                    global _TTNN_DEVICE
-                    _TTNN_DEVICE = ttnn.open_device(device_id=0)
-                    report_benchmarks(seed, args.report_runs, True)
-                    ttnn.close_device(_TTNN_DEVICE)
-                else:
-                    report_benchmarks(seed, args.report_runs, False)
+                engine = create_backend(backend)
+                try:
+                    report_benchmarks(seed, args.report_runs, engine)
+                finally:
+                    engine.close()
                 return
 
-            # First test validation with original seed
-            print("Testing validation...", file=sys.stderr)
-            test_validation(seed)
+            # First test validation with original seed (once per seed)
+            if next_nonce == 0:
+                print("Testing validation...", file=sys.stderr)
+                test_validation(seed)
             
             # Mine (matrices generated per-nonce inside)
-            print("Mining...", file=sys.stderr)
-            if args.gpu:
+            print(f"Mining from nonce {next_nonce}...", file=sys.stderr)
+            if use_gpu:
                 print("[!] GPU mode prioritizes speed over accuracy; valid_math may be false", file=sys.stderr)
-                result = mine_gpu_fast(seed, difficulty, args.iterations)
+                result = mine_gpu_fast(seed, difficulty, args.iterations, backend, next_nonce)
             else:
-                result = mine_correct(seed, difficulty, args.iterations)
+                result = mine_correct(seed, difficulty, args.iterations, backend, next_nonce)
             
             if result["success"]:
-                # Submit solution
-                print("Submitting solution...", file=sys.stderr)
-                validation = submit_solution(result["solution"])
-                print(f"Validation result: {validation}", file=sys.stderr)
-                
-                if validation.get("valid"):
-                    print("SUCCESS! Solution accepted!", file=sys.stderr)
-                else:
-                    print(f"Solution rejected: {validation}", file=sys.stderr)
+                # Queue solution; the outbox submits it while we keep mining
+                sol_id = outbox.enqueue(result["solution"])
+                print(f"Queued solution {sol_id} ({outbox.pending()} pending)", file=sys.stderr)
+                next_nonce = result["nonce"] + 1
+            else:
+                next_nonce += args.iterations
             
             if not args.loop:
                 break
@@ -549,8 +565,13 @@ def main():
             if not args.loop:
                 break
             time.sleep(5)
+
+    if outbox is not None:
+        if outbox.pending():
+            print(f"Waiting for {outbox.pending()} pending submission(s)...", file=sys.stderr)
+        outbox.close(timeout=args.drain_timeout)
     
-    print(json.dumps(result if 'result' in dir() else {"error": "No result"}))
+    print(json.dumps(result if 'result' in dir() else {"error": "No result"}, default=lambda b: b.hex()))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Solution Outbox - durable, non-blocking solution submission
+Found solutions are appended to an on-disk log and drained by a background
+submitter with retries and exponential backoff, so mining never waits on RPC.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+import urllib.request
+import urllib.error
+
+# Nonce lives in the last 12 bytes of the 240-byte seed; everything before it
+# identifies the round (epoch, segment_vr_hash, pk, pop).
+_ROUND_PREFIX_LEN = 228
+
+DEFAULT_OUTBOX_PATH = os.environ.get("OUTBOX_PATH", "outbox.jsonl")
+
+
+def round_key(seed: bytes) -> str:
+    """Identify the mining round a seed (or solution) belongs to"""
+    return hashlib.sha256(seed[:_ROUND_PREFIX_LEN]).hexdigest()[:16]
+
+
+def solution_id(solution: bytes) -> str:
+    """Identify a solution; the stand-in server logs the same id"""
+    return hashlib.sha256(solution).hexdigest()[:16]
+
+
+def submit_solution(rpc_url: str, solution: bytes, timeout: float = 10) -> dict:
+    """Submit solution to RPC for validation"""
+    import base58
+    sol_b58 = base58.b58encode(solution).decode()
+    req = urllib.request.Request(f"{rpc_url}/api/upow/validate/{sol_b58}")
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read())
+
+
+class SolutionOutbox:
+    """
+    Append-only JSONL queue of found solutions.
+
+    Records:
+      {"op": "put",  "id": ..., "round": ..., "solution": hex, "ts": ...}
+      {"op": "done", "id": ..., "round": ..., "result": {...}}
+      {"op": "drop", "id": ..., "round": ..., "reason": ...}
+
+    On open the log is replayed; entries without a "done"/"drop" record are
+    resubmitted, so solutions survive crashes and restarts. Network errors,
+    5xx and 429 are retried with capped backoff until the round goes stale;
+    only other 4xx responses and stale rounds drop an entry. Ids resolved in
+    the current round are remembered so re-found solutions are not resent.
+    """
+
+    def __init__(self, path: str = DEFAULT_OUTBOX_PATH, rpc_url: str = None,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 30.0, timeout: float = 10,
+                 submit_fn=None, on_result=None):
+        self.path = path
+        self.rpc_url = rpc_url
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.submit_fn = submit_fn or (lambda sol: submit_solution(self.rpc_url, sol, self.timeout))
+        self.on_result = on_result or _print_result
+
+        self._cond = threading.Condition()
+        self._pending = {}          # id -> entry (insertion ordered)
+        self._resolved = {}         # id -> round, for entries already done/dropped
+        self._current_round = None
+        self._in_flight = None
+        self._stopping = False
+        self._thread = None
+
+        self._replay()
+        self._log = open(self.path, "a")
+
+    # --- log ---------------------------------------------------------------
+
+    def _replay(self):
+        """Load pending entries and compact the log down to them"""
+        if not os.path.exists(self.path):
+            return
+        put_rounds = {}
+        tombstones = {}
+        latest_round = None
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn write from a crash
+                op = rec.get("op")
+                if op == "put":
+                    rec.update(attempts=0, next_at=0.0)
+                    self._pending[rec["id"]] = rec
+                    put_rounds[rec["id"]] = latest_round = rec["round"]
+                elif op in ("done", "drop"):
+                    self._pending.pop(rec.get("id"), None)
+                    rec.setdefault("round", put_rounds.get(rec.get("id")))
+                    tombstones[rec.get("id")] = rec
+                    latest_round = rec["round"] or latest_round
+
+        # Only the newest round's resolved ids can still be re-found
+        tombstones = {i: rec for i, rec in tombstones.items() if rec["round"] == latest_round}
+        self._resolved = {i: rec["round"] for i, rec in tombstones.items()}
+
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            for rec in tombstones.values():
+                f.write(json.dumps(rec) + "\n")
+            for entry in self._pending.values():
+                f.write(json.dumps(_put_record(entry)) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+        if self._pending:
+            print(f"[outbox] Recovered {len(self._pending)} pending solution(s) from {self.path}", file=sys.stderr)
+
+    def _append(self, rec: dict):
+        self._log.write(json.dumps(rec) + "\n")
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    # --- producer API ------------------------------------------------------
+
+    def enqueue(self, solution: bytes) -> str:
+        """Persist a solution and hand it to the submitter; returns its id"""
+        entry = {
+            "op": "put",
+            "id": solution_id(solution),
+            "round": round_key(solution),
+            "solution": solution.hex(),
+            "ts": time.time(),
+            "attempts": 0,
+            "next_at": 0.0,
+        }
+        with self._cond:
+            if entry["id"] not in self._pending and entry["id"] not in self._resolved:
+                self._append(_put_record(entry))
+                self._pending[entry["id"]] = entry
+            self._cond.notify_all()
+        return entry["id"]
+
+    def set_round(self, seed: bytes):
+        """Mark the current round; pending entries from older rounds are dropped"""
+        with self._cond:
+            self._current_round = round_key(seed)
+            self._resolved = {i: r for i, r in self._resolved.items() if r == self._current_round}
+            for entry in list(self._pending.values()):
+                if entry is not self._in_flight and entry["round"] != self._current_round:
+                    self._drop(entry, "stale")
+            self._cond.notify_all()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def drain(self, timeout: float = None) -> bool:
+        """Block until the queue is empty; returns False on timeout"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # --- submitter ---------------------------------------------------------
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="outbox-submitter", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self, timeout: float = 0):
+        """Stop the submitter; undelivered entries stay on disk for next start"""
+        if timeout:
+            self.drain(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._log.close()
+
+    def _resolve(self, entry: dict, rec: dict):
+        self._append(dict(rec, id=entry["id"], round=entry["round"]))
+        self._pending.pop(entry["id"], None)
+        self._resolved[entry["id"]] = entry["round"]
+
+    def _drop(self, entry: dict, reason: str):
+        self._resolve(entry, {"op": "drop", "reason": reason})
+        print(f"[outbox] Dropped {entry['id']} ({reason})", file=sys.stderr)
+
+    def _next_entry(self):
+        """Wait for the next due entry (caller holds the lock)"""
+        while not self._stopping:
+            now = time.time()
+            due = None
+            for entry in list(self._pending.values()):
+                if self._current_round is not None and entry["round"] != self._current_round:
+                    self._drop(entry, "stale")
+                    continue
+                if due is None or entry["next_at"] < due["next_at"]:
+                    due = entry
+            if due is None:
+                self._cond.notify_all()
+                self._cond.wait()
+            elif due["next_at"] > now:
+                self._cond.wait(due["next_at"] - now)
+            else:
+                return due
+        return None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                entry = self._next_entry()
+                if entry is None:
+                    return
+                self._in_flight = entry
+                entry["attempts"] += 1
+
+            result, error, retry = None, None, False
+            try:
+                result = self.submit_fn(bytes.fromhex(entry["solution"]))
+            except urllib.error.HTTPError as e:
+                error = f"HTTP {e.code}"
+                retry = e.code >= 500 or e.code == 429
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                retry = True
+
+            with self._cond:
+                self._in_flight = None
+                if entry["id"] not in self._pending:
+                    pass
+                elif error is None:
+                    self._resolve(entry, {"op": "done", "result": result})
+                    self.on_result(entry, result)
+                elif retry:
+                    delay = min(self.backoff_max, self.backoff_base * (2 ** min(entry["attempts"] - 1, 32)))
+                    entry["next_at"] = time.time() + delay
+                    print(f"[outbox] Submit {entry['id']} failed ({error}), attempt {entry['attempts']}, retry in {delay:.1f}s", file=sys.stderr)
+                else:
+                    self._drop(entry, error)
+                self._cond.notify_all()
+
+
+def _put_record(entry: dict) -> dict:
+    return {k: entry[k] for k in ("op", "id", "round", "solution", "ts")}
+
+
+def _print_result(entry: dict, result: dict):
+    if result.get("valid"):
+        print(f"SUCCESS! Solution {entry['id']} accepted! {result}", file=sys.stderr)
+    else:
+        print(f"Solution {entry['id']} rejected: {result}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drain a HardHack solution outbox")
+    parser.add_argument("--path", default=DEFAULT_OUTBOX_PATH, help="Outbox file")
+    parser.add_argument("--rpc-url", default=os.environ.get("RPC_URL", "https://testnet-rpc.ama.one"), help="RPC base URL")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for the queue to drain")
+    args = parser.parse_args()
+
+    outbox = SolutionOutbox(args.path, args.rpc_url).start()
+    drained = outbox.drain(args.timeout)
+    left = outbox.pending()
+    outbox.close()
+    print(json.dumps({"drained": drained, "pending": left}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+#include "compute.h"
+#include <cstddef>
+
+// C ABI over ComputeDevice so Python can load the native matmul via ctypes.
+// Layout per batch item matches the miner: A is M*K u8, B is K*N i8, C is M*N i32.
+
+namespace {
+ComputeDevice& device() {
+    static std::unique_ptr<ComputeDevice> dev = create_cpu_compute();
+    return *dev;
+}
+}
+
+extern "C" {
+
+const char* hardhack_compute_name() {
+    static const std::string name = device().name();
+    return name.c_str();
+}
+
+void hardhack_matmul_batch(const uint8_t* A, const int8_t* B, int32_t* C, size_t batch) {
+    ComputeDevice& dev = device();
+    #pragma omp parallel for
+    for (long b = 0; b < (long)batch; ++b) {
+        dev.matmul(A + b * (size_t)M * K, B + b * (size_t)K * N, C + b * (size_t)M * N);
+    }
+}
+
+}
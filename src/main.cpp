@@ -3,6 +3,8 @@
 #include <vector>
 #include <memory>
 #include <algorithm>
+#include <atomic>
+#include <csignal>
 #include "miner.h"
 #include "compute.h"
 
@@ -55,19 +57,45 @@ std::string bytes_to_hex(const std::vector<uint8_t>& bytes) {
     return res;
 }
 
+// Set on SIGTERM/SIGINT (e.g. mine.sh on seed rotation or timeout) so the
+// miner stops within one nonce and still prints its exact iteration count
+std::atomic<bool> g_stop{false};
+
+void handle_stop(int) { g_stop.store(true); }
+
+void print_result(const MiningResult& res) {
+    double hps = (res.duration_ms > 0) ? (res.iterations / (res.duration_ms / 1000.0)) : 0;
+
+    // Output JSON
+    std::cout << "{"
+              << "\"found\": " << (res.success ? "true" : "false") << ", "
+              << "\"iterations\": " << res.iterations << ", "
+              << "\"hashes_per_sec\": " << hps << ", "
+              << "\"solution_hex\": \"" << (res.success ? bytes_to_hex(res.solution) : "") << "\", "
+              << "\"solution_b58\": \"" << (res.success ? encode_base58(res.solution) : "") << "\""
+              << "}" << std::endl;
+}
+
 int main(int argc, char* argv[]) {
     std::string seed_hex = "";
     int difficulty = 10;
     uint64_t iterations = 0;
+    std::vector<std::pair<std::string, int>> extra_jobs;  // --job <seed_hex>[:difficulty]
 
     for (int i = 1; i < argc; ++i) {
         std::string arg = argv[i];
         if (arg == "--seed" && i + 1 < argc) seed_hex = argv[++i];
         else if (arg == "--difficulty" && i + 1 < argc) difficulty = std::stoi(argv[++i]);
         else if (arg == "--iterations" && i + 1 < argc) iterations = std::stoull(argv[++i]);
+        else if (arg == "--job" && i + 1 < argc) {
+            std::string spec = argv[++i];
+            size_t colon = spec.find(':');
+            int job_diff = (colon == std::string::npos) ? -1 : std::stoi(spec.substr(colon + 1));
+            extra_jobs.emplace_back(spec.substr(0, colon), job_diff);
+        }
     }
 
-    if (seed_hex.empty()) return 1;
+    if (seed_hex.empty() && extra_jobs.empty()) return 1;
 
     std::unique_ptr<ComputeDevice> compute_device;
 #ifdef ENABLE_TT
@@ -76,19 +104,24 @@ int main(int argc, char* argv[]) {
     compute_device = create_cpu_compute();
 #endif
 
+    std::signal(SIGTERM, handle_stop);
+    std::signal(SIGINT, handle_stop);
+
     Miner miner(std::move(compute_device));
-    MiningResult res = miner.mine(hex_to_bytes(seed_hex), difficulty, iterations == 0 ? 0xFFFFFFFFFFFFFFFF : iterations);
+    uint64_t max_iterations = iterations == 0 ? 0xFFFFFFFFFFFFFFFF : iterations;
 
-    double hps = (res.duration_ms > 0) ? (res.iterations / (res.duration_ms / 1000.0)) : 0;
+    if (extra_jobs.empty()) {
+        print_result(miner.mine(hex_to_bytes(seed_hex), difficulty, max_iterations, &g_stop));
+        return 0;
+    }
 
-    // Output JSON
-    std::cout << "{"
-              << "\"found\": " << (res.success ? "true" : "false") << ", "
-              << "\"iterations\": " << res.iterations << ", "
-              << "\"hashes_per_sec\": " << hps << ", "
-              << "\"solution_hex\": \"" << (res.success ? bytes_to_hex(res.solution) : "") << "\", "
-              << "\"solution_b58\": \"" << (res.success ? encode_base58(res.solution) : "") << "\""
-              << "}" << std::endl;
+    // Several seeds/difficulties mined concurrently; one JSON line per job, in order
+    std::vector<MiningJob> jobs;
+    if (!seed_hex.empty()) jobs.push_back({hex_to_bytes(seed_hex), difficulty, max_iterations});
+    for (const auto& job : extra_jobs) {
+        jobs.push_back({hex_to_bytes(job.first), job.second < 0 ? difficulty : job.second, max_iterations});
+    }
+    for (const MiningResult& res : miner.mine_many(jobs, &g_stop)) print_result(res);
 
     return 0;
 }
@@ -2,6 +2,8 @@
 #include "blake3.h"
 #include <cstring>
 #include <chrono>
+#include <mutex>
+#include <algorithm>
 #include <omp.h>
 #include <iostream>
 #include <iomanip>
@@ -18,98 +20,178 @@ inline bool check_diff_fast(const uint8_t* hash, int bits) {
     return true;
 }
 
-MiningResult Miner::mine(const std::vector<uint8_t>& rpc_seed, int difficulty_bits, uint64_t max_iterations) {
-    auto start = std::chrono::high_resolution_clock::now();
-    std::vector<uint8_t> base_seed = rpc_seed;
-    if (base_seed.size() != 240) base_seed.resize(240, 0);
+namespace {
 
-    MiningResult final_res = {false, {}, {}, 0, 0};
-    bool found_global = false;
-    uint64_t total_iterations = 0;
-    auto last_progress = std::chrono::high_resolution_clock::now();
+using Clock = std::chrono::high_resolution_clock;
+
+// Chunk sizing: aim for ~20ms of work per claim so the cursor is not contended,
+// but never take more than 1/(2*threads) of what is left so the tail stays balanced.
+constexpr double kTargetChunkNs = 20e6;
+constexpr uint64_t kMaxChunk = 4096;
+
+struct JobState {
+    std::vector<uint8_t> base_seed;
+    int difficulty_bits;
+    uint64_t max_iterations;
+    uint64_t base_low;                      // Nonce offset taken from the seed
+    uint32_t base_high;
+
+    std::atomic<uint64_t> cursor{0};        // Next unclaimed nonce index
+    std::atomic<uint64_t> hashes{0};        // Hashes actually evaluated
+    std::atomic<bool> stop{false};          // Set once a solution is found
+    std::atomic<int64_t> last_ns{0};        // Last chunk completion, relative to start
+
+    std::mutex result_mutex;
+    MiningResult result = {false, {}, {}, 0, 0};
+
+    bool exhausted() const { return cursor.load(std::memory_order_relaxed) >= max_iterations; }
+    bool finished() const { return stop.load(std::memory_order_relaxed) || exhausted(); }
+};
+
+// Write nonce index into the 12-byte nonce (240 - 12 = 228), offset by the seed's own nonce
+inline void set_nonce(uint8_t* seed, const JobState& job, uint64_t index) {
+    uint64_t low = job.base_low + index;
+    uint32_t high = job.base_high + (low < job.base_low ? 1 : 0);
+    std::memcpy(seed + 228, &low, sizeof(low));
+    std::memcpy(seed + 236, &high, sizeof(high));
+}
+
+} // namespace
+
+MiningResult Miner::mine(const std::vector<uint8_t>& rpc_seed, int difficulty_bits, uint64_t max_iterations,
+                         const std::atomic<bool>* stop) {
+    return mine_many({MiningJob{rpc_seed, difficulty_bits, max_iterations}}, stop)[0];
+}
+
+std::vector<MiningResult> Miner::mine_many(const std::vector<MiningJob>& jobs, const std::atomic<bool>* stop) {
+    auto start = Clock::now();
+    const std::atomic<bool> never_stop{false};
+    const std::atomic<bool>& cancel = stop ? *stop : never_stop;
+
+    std::vector<std::unique_ptr<JobState>> states;
+    for (const MiningJob& job : jobs) {
+        auto st = std::make_unique<JobState>();
+        st->base_seed = job.seed;
+        if (st->base_seed.size() != 240) st->base_seed.resize(240, 0);
+        st->difficulty_bits = job.difficulty_bits;
+        st->max_iterations = job.max_iterations;
+        std::memcpy(&st->base_low, &st->base_seed[228], sizeof(st->base_low));
+        std::memcpy(&st->base_high, &st->base_seed[236], sizeof(st->base_high));
+        states.push_back(std::move(st));
+    }
+    const size_t num_jobs = states.size();
+    auto last_progress = start;
+    uint64_t last_progress_hashes = 0;
 
     #pragma omp parallel
     {
         int thread_id = omp_get_thread_num();
         int num_threads = omp_get_num_threads();
-        
+
         std::vector<uint8_t> xof_buf(2 * M * K);
         int32_t local_C[M * N];
-        std::vector<uint8_t> local_seed = base_seed;
-        
-        // Use all 12 bytes of the nonce (240 - 12 = 228)
-        uint64_t* n_low = reinterpret_cast<uint64_t*>(&local_seed[228]);
-        uint32_t* n_high = reinterpret_cast<uint32_t*>(&local_seed[236]);
-        
-        // Distribute starting points
-        *n_low = (uint64_t)thread_id * (0xFFFFFFFFFFFFFFFF / num_threads);
-        *n_high = (uint32_t)thread_id;
-
+        uint8_t local_seed[240];
         blake3_hasher hasher;
         uint8_t h_out[BLAKE3_OUT_LEN];
-        uint64_t local_iterations = 0;
-
-        for (uint64_t i = 0; i < (max_iterations / num_threads) && !found_global; ++i) {
-            (*n_low)++;
-            if (*n_low == 0) (*n_high)++;
-
-            blake3_hasher_init(&hasher);
-            blake3_hasher_update(&hasher, local_seed.data(), 240);
-            blake3_hasher_finalize(&hasher, xof_buf.data(), xof_buf.size());
-            
-            device_->matmul(xof_buf.data(), reinterpret_cast<const int8_t*>(xof_buf.data() + (M * K)), local_C);
-
-            blake3_hasher sol_hasher;
-            blake3_hasher_init(&sol_hasher);
-            blake3_hasher_update(&sol_hasher, local_seed.data(), 240);
-            blake3_hasher_update(&sol_hasher, local_C, 1024);
-            blake3_hasher_finalize(&sol_hasher, h_out, BLAKE3_OUT_LEN);
-
-            if (check_diff_fast(h_out, difficulty_bits)) {
-                #pragma omp critical
-                {
-                    if (!found_global) {
-                        found_global = true;
-                        final_res.success = true;
-                        final_res.solution = local_seed;
+
+        double ns_per_hash = 0.0;  // EWMA of this thread's speed; 0 = unknown
+        size_t job_idx = thread_id % std::max<size_t>(num_jobs, 1);
+
+        while (num_jobs > 0 && !cancel.load(std::memory_order_relaxed)) {
+            // Pick the next unfinished job, round-robin from where we left off
+            JobState* job = nullptr;
+            for (size_t k = 0; k < num_jobs; ++k) {
+                size_t j = (job_idx + k) % num_jobs;
+                if (!states[j]->finished()) { job = states[j].get(); job_idx = j; break; }
+            }
+            if (!job) break;
+
+            uint64_t want = ns_per_hash > 0 ? (uint64_t)(kTargetChunkNs / ns_per_hash) : 1;
+            uint64_t claimed = job->cursor.load(std::memory_order_relaxed);
+            uint64_t remaining = job->max_iterations > claimed ? job->max_iterations - claimed : 0;
+            want = std::max<uint64_t>(1, std::min({want, kMaxChunk, remaining / (2 * num_threads)}));
+
+            uint64_t begin = job->cursor.fetch_add(want, std::memory_order_relaxed);
+            if (begin >= job->max_iterations) continue;
+            uint64_t end = std::min(begin + want, job->max_iterations);
+
+            std::memcpy(local_seed, job->base_seed.data(), 240);
+            auto chunk_start = Clock::now();
+            uint64_t processed = 0;
+
+            for (uint64_t n = begin; n < end; ++n) {
+                if (job->stop.load(std::memory_order_relaxed) || cancel.load(std::memory_order_relaxed)) break;
+                set_nonce(local_seed, *job, n);
+
+                blake3_hasher_init(&hasher);
+                blake3_hasher_update(&hasher, local_seed, 240);
+                blake3_hasher_finalize(&hasher, xof_buf.data(), xof_buf.size());
+
+                device_->matmul(xof_buf.data(), reinterpret_cast<const int8_t*>(xof_buf.data() + (M * K)), local_C);
+
+                blake3_hasher sol_hasher;
+                blake3_hasher_init(&sol_hasher);
+                blake3_hasher_update(&sol_hasher, local_seed, 240);
+                blake3_hasher_update(&sol_hasher, local_C, 1024);
+                blake3_hasher_finalize(&sol_hasher, h_out, BLAKE3_OUT_LEN);
+                processed++;
+
+                if (check_diff_fast(h_out, job->difficulty_bits)) {
+                    std::lock_guard<std::mutex> lock(job->result_mutex);
+                    if (!job->stop.exchange(true)) {
+                        MiningResult& res = job->result;
+                        res.success = true;
+                        res.nonce.assign(local_seed + 228, local_seed + 240);
+                        res.solution.assign(local_seed, local_seed + 240);
                         const uint8_t* c_bytes = reinterpret_cast<const uint8_t*>(local_C);
-                        final_res.solution.insert(final_res.solution.end(), c_bytes, c_bytes + 1024);
-                        final_res.iterations = i * num_threads;
+                        res.solution.insert(res.solution.end(), c_bytes, c_bytes + 1024);
                     }
+                    break;
                 }
             }
 
-            local_iterations++;
-            
-            // Progress reporting every 1M iterations (thread 0 only)
-            if (thread_id == 0 && (local_iterations % 1000000 == 0)) {
-                #pragma omp critical
-                {
-                    total_iterations += 1000000 * num_threads;
-                    auto now = std::chrono::high_resolution_clock::now();
-                    auto elapsed = std::chrono::duration<double>(now - last_progress).count();
-                    if (elapsed >= 5.0) {  // Report every 5 seconds
-                        double total_elapsed = std::chrono::duration<double>(now - start).count();
-                        double hps = total_iterations / elapsed;
-                        double expected_hashes = 1ULL << difficulty_bits;
-                        double progress = std::min(100.0, (total_iterations * 100.0) / expected_hashes);
-                        std::cerr << "[Progress] " << (total_iterations / 1000000) << "M hashes, "
-                                  << (int)hps << " H/s, ~" << std::fixed << std::setprecision(1) 
-                                  << progress << "% expected" << std::endl;
-                        last_progress = now;
-                        total_iterations = 0;
-                    }
-                }
+            auto now = Clock::now();
+            job->hashes.fetch_add(processed, std::memory_order_relaxed);
+            job->last_ns.store(std::chrono::duration_cast<std::chrono::nanoseconds>(now - start).count(),
+                               std::memory_order_relaxed);
+            if (processed > 0) {
+                double sample = std::chrono::duration<double, std::nano>(now - chunk_start).count() / processed;
+                ns_per_hash = ns_per_hash > 0 ? 0.7 * ns_per_hash + 0.3 * sample : sample;
             }
-        }
 
-        #pragma omp critical
-        {
-            final_res.iterations += local_iterations;
+            // Spread threads over concurrent jobs
+            if (num_jobs > 1) job_idx = (job_idx + 1) % num_jobs;
+
+            // Progress reporting every 5 seconds (thread 0 only)
+            if (thread_id == 0 && std::chrono::duration<double>(now - last_progress).count() >= 5.0) {
+                uint64_t total = 0;
+                for (const auto& st : states) total += st->hashes.load(std::memory_order_relaxed);
+                double elapsed = std::chrono::duration<double>(now - last_progress).count();
+                double hps = (total - last_progress_hashes) / elapsed;
+                std::cerr << "[Progress] " << (total / 1000000.0) << "M hashes, " << (int)hps << " H/s";
+                if (num_jobs == 1) {
+                    double expected_hashes = 1ULL << states[0]->difficulty_bits;
+                    double progress = std::min(100.0, (total * 100.0) / expected_hashes);
+                    std::cerr << ", ~" << std::fixed << std::setprecision(1) << progress << "% expected";
+                } else {
+                    size_t active = 0;
+                    for (const auto& st : states) active += st->finished() ? 0 : 1;
+                    std::cerr << ", " << active << "/" << num_jobs << " jobs active";
+                }
+                std::cerr << std::endl;
+                last_progress = now;
+                last_progress_hashes = total;
+            }
         }
     }
 
-    auto end = std::chrono::high_resolution_clock::now();
-    final_res.duration_ms = std::chrono::duration<double, std::milli>(end - start).count();
-    return final_res;
-}
\ No newline at end of file
+    std::vector<MiningResult> results;
+    results.reserve(num_jobs);
+    for (auto& st : states) {
+        MiningResult res = st->result;
+        res.iterations = st->hashes.load();
+        res.duration_ms = st->last_ns.load() / 1e6;
+        results.push_back(std::move(res));
+    }
+    return results;
+}
@@ -4,8 +4,11 @@
 #include <iomanip>
 #include <sstream>
 #include <cmath>
+#include <cstring>
+#include <string>
 #include <omp.h>
 #include "blake3.h"
+#include "merkle.h"
 
 #if defined(__ARM_NEON) || defined(__ARM_NEON__)
 #include <arm_neon.h>
@@ -96,10 +99,255 @@ std::string bytes_to_hex(const uint8_t* bytes, size_t len) {
     return ss.str();
 }
 
+// ---------------------------------------------------------------------------
+// Commitment mode: batched LDE (coset NTT) streamed into a Merkle tree.
+//
+// Evaluations live in one row-major matrix evals[row * polys + p], so each NTT
+// butterfly updates a whole row (all polynomials at one domain point) and row
+// i is Merkle leaf i with no transpose or per-leaf copies. Leaf hashing is
+// fused into the last NTT stage, which is the first time a row is final.
+// Tree nodes use heap layout (root = 1, leaves = L + i) and the same hashing
+// as MerkleTree, so openings verify with MerkleTree::verify_proof.
+// ---------------------------------------------------------------------------
+
+const size_t HASH_LEN = BLAKE3_OUT_LEN;
+
+struct Commitment {
+    size_t polys;
+    size_t rows;                    // LDE domain size L
+    std::vector<uint32_t> evals;    // rows x polys, row-major
+    std::vector<uint8_t> nodes;     // 2L x 32 bytes, heap layout
+    double lde_ms;                  // Coefficients + NTT + fused leaf hashing
+    double tree_ms;                 // Internal levels
+};
+
+struct Opening {
+    std::vector<uint32_t> values;   // Row of evaluations (one per polynomial)
+    MerkleProof proof;
+};
+
+inline void hash_row(const uint32_t* row, size_t polys, uint8_t* out) {
+    blake3_hasher hasher;
+    blake3_hasher_init(&hasher);
+    blake3_hasher_update(&hasher, row, polys * sizeof(uint32_t));
+    blake3_hasher_finalize(&hasher, out, HASH_LEN);
+}
+
+Commitment commit_polynomials(const std::string& seed_hex, size_t polys, int log_n, int log_blowup) {
+    Commitment c;
+    const size_t n = size_t(1) << log_n;
+    const size_t L = n << log_blowup;
+    c.polys = polys;
+    c.rows = L;
+    c.evals.assign(L * polys, 0);
+    c.nodes.resize(2 * L * HASH_LEN);
+
+    auto start = std::chrono::high_resolution_clock::now();
+
+    // 1. Coefficients from the seed (BLAKE3 XOF), rows 0..n-1; rows n..L-1 stay zero
+    blake3_hasher xof;
+    blake3_hasher_init(&xof);
+    blake3_hasher_update(&xof, seed_hex.data(), seed_hex.size());
+    const size_t row_bytes = polys * sizeof(uint32_t);
+    #pragma omp parallel for
+    for (long i = 0; i < (long)n; i++) {
+        uint32_t* row = &c.evals[i * polys];
+        blake3_hasher_finalize_seek(&xof, i * row_bytes, reinterpret_cast<uint8_t*>(row), row_bytes);
+        for (size_t p = 0; p < polys; p++) row[p] %= P;
+    }
+
+    // 2. Coset shift: coefficient i *= G^i, so we evaluate on G * <w_L>
+    #pragma omp parallel for
+    for (long i = 0; i < (long)n; i++) {
+        uint32_t s = power(G, (uint32_t)i);
+        uint32_t* row = &c.evals[i * polys];
+        for (size_t p = 0; p < polys; p++) row[p] = (uint64_t)row[p] * s % P;
+    }
+
+    // 3. Bit-reversal permutation of rows
+    for (size_t i = 1, j = 0; i < L; i++) {
+        size_t bit = L >> 1;
+        for (; j & bit; bit >>= 1) j ^= bit;
+        j ^= bit;
+        if (i < j) std::swap_ranges(&c.evals[i * polys], &c.evals[(i + 1) * polys], &c.evals[j * polys]);
+    }
+
+    // 4. Row-wise NTT stages; the final stage hashes each pair of rows as it completes them
+    std::vector<uint32_t> twiddles = precompute_twiddles((int)L);
+    uint8_t* leaves = &c.nodes[L * HASH_LEN];
+    for (size_t len = 2; len <= L; len <<= 1) {
+        const size_t half = len / 2;
+        const size_t step = L / len;
+        const bool last = (len == L);
+
+        #pragma omp parallel for schedule(static)
+        for (long b = 0; b < (long)(L / 2); b++) {
+            size_t i = (b / half) * len;
+            size_t j = b % half;
+            uint32_t w = twiddles[j * step];
+            uint32_t* lo = &c.evals[(i + j) * polys];
+            uint32_t* hi = &c.evals[(i + j + half) * polys];
+            for (size_t p = 0; p < polys; p++) {
+                uint32_t u = lo[p];
+                uint32_t v = (uint64_t)hi[p] * w % P;
+                lo[p] = field_add(u, v);
+                hi[p] = field_sub(u, v);
+            }
+            if (last) {
+                hash_row(lo, polys, leaves + (i + j) * HASH_LEN);
+                hash_row(hi, polys, leaves + (i + j + half) * HASH_LEN);
+            }
+        }
+    }
+
+    auto lde_end = std::chrono::high_resolution_clock::now();
+
+    // 5. Internal levels, each level in parallel
+    for (size_t width = L / 2; width >= 1; width /= 2) {
+        #pragma omp parallel for schedule(static)
+        for (long k = (long)width; k < (long)(2 * width); k++) {
+            blake3_hasher hasher;
+            blake3_hasher_init(&hasher);
+            blake3_hasher_update(&hasher, &c.nodes[2 * k * HASH_LEN], 2 * HASH_LEN);
+            blake3_hasher_finalize(&hasher, &c.nodes[k * HASH_LEN], HASH_LEN);
+        }
+    }
+
+    auto tree_end = std::chrono::high_resolution_clock::now();
+    c.lde_ms = std::chrono::duration<double, std::milli>(lde_end - start).count();
+    c.tree_ms = std::chrono::duration<double, std::milli>(tree_end - lde_end).count();
+    return c;
+}
+
+Opening open_position(const Commitment& c, size_t index) {
+    Opening o;
+    const size_t L = c.rows;
+    o.values.assign(&c.evals[index * c.polys], &c.evals[(index + 1) * c.polys]);
+    o.proof.leaf_index = (uint32_t)index;
+    o.proof.leaf.assign(&c.nodes[(L + index) * HASH_LEN], &c.nodes[(L + index + 1) * HASH_LEN]);
+    o.proof.root_hash.assign(&c.nodes[HASH_LEN], &c.nodes[2 * HASH_LEN]);
+    for (size_t k = L + index; k > 1; k /= 2) {
+        size_t sib = k ^ 1;
+        o.proof.siblings.emplace_back(&c.nodes[sib * HASH_LEN], &c.nodes[(sib + 1) * HASH_LEN]);
+    }
+    return o;
+}
+
+bool verify_opening(const Opening& o) {
+    uint8_t leaf[HASH_LEN];
+    hash_row(o.values.data(), o.values.size(), leaf);
+    return std::memcmp(leaf, o.proof.leaf.data(), HASH_LEN) == 0 && MerkleTree::verify_proof(o.proof);
+}
+
+// Query positions derived from the root (Fiat-Shamir style)
+std::vector<size_t> query_positions(const Commitment& c, int queries) {
+    std::vector<size_t> positions;
+    for (int q = 0; q < queries; q++) {
+        uint64_t r;
+        blake3_hasher hasher;
+        blake3_hasher_init(&hasher);
+        blake3_hasher_update(&hasher, &c.nodes[HASH_LEN], HASH_LEN);
+        blake3_hasher_update(&hasher, &q, sizeof(q));
+        blake3_hasher_finalize(&hasher, reinterpret_cast<uint8_t*>(&r), sizeof(r));
+        positions.push_back(r % c.rows);
+    }
+    return positions;
+}
+
+int run_commitment(const std::string& seed_hex, size_t polys, int log_n, int log_blowup, int queries, bool show_openings) {
+    Commitment c = commit_polynomials(seed_hex, polys, log_n, log_blowup);
+
+    auto open_start = std::chrono::high_resolution_clock::now();
+    std::vector<Opening> openings;
+    for (size_t pos : query_positions(c, queries)) openings.push_back(open_position(c, pos));
+    auto open_end = std::chrono::high_resolution_clock::now();
+
+    bool valid = true;
+    for (const Opening& o : openings) valid = valid && verify_opening(o);
+    auto verify_end = std::chrono::high_resolution_clock::now();
+
+    double open_ms = std::chrono::duration<double, std::milli>(open_end - open_start).count();
+    double verify_ms = std::chrono::duration<double, std::milli>(verify_end - open_end).count();
+    double commit_ms = c.lde_ms + c.tree_ms;
+    double evals = (double)c.rows * polys;
+
+    std::cout << "{"
+              << "\"type\": \"ntt_merkle_commitment\", "
+              << "\"status\": \"" << (valid ? "success" : "failure") << "\", "
+              << "\"polys\": " << polys << ", "
+              << "\"poly_size\": " << (size_t(1) << log_n) << ", "
+              << "\"blowup\": " << (1 << log_blowup) << ", "
+              << "\"lde_size\": " << c.rows << ", "
+              << "\"root_hash\": \"" << bytes_to_hex(&c.nodes[HASH_LEN], HASH_LEN) << "\", "
+              << "\"lde_ms\": " << c.lde_ms << ", "
+              << "\"tree_ms\": " << c.tree_ms << ", "
+              << "\"commit_ms\": " << commit_ms << ", "
+              << "\"open_ms\": " << open_ms << ", "
+              << "\"verify_ms\": " << verify_ms << ", "
+              << "\"throughput_mevals\": " << (evals / (commit_ms / 1000.0) / 1e6) << ", "
+              << "\"throughput_mb_s\": " << (evals * sizeof(uint32_t) / (commit_ms / 1000.0) / 1e6);
+    if (show_openings) {
+        std::cout << ", \"openings\": [";
+        for (size_t q = 0; q < openings.size(); q++) {
+            const Opening& o = openings[q];
+            std::cout << (q ? ", " : "") << "{\"index\": " << o.proof.leaf_index << ", \"values\": [";
+            for (size_t p = 0; p < o.values.size(); p++) std::cout << (p ? ", " : "") << o.values[p];
+            std::cout << "], \"path\": [";
+            for (size_t k = 0; k < o.proof.siblings.size(); k++) {
+                std::cout << (k ? ", " : "") << "\"" << bytes_to_hex(o.proof.siblings[k].data(), HASH_LEN) << "\"";
+            }
+            std::cout << "]}";
+        }
+        std::cout << "]";
+    }
+    std::cout << "}" << std::endl;
+
+    return valid ? 0 : 1;
+}
+
 int main(int argc, char* argv[]) {
     std::string seed_hex = "00000000";
+    bool commit_mode = false;
+    bool benchmark_mode = false;
+    size_t polys = 16;
+    int log_n = 16;
+    int log_blowup = 2;
+    int queries = 8;
     for (int i = 1; i < argc; ++i) {
-        if (std::string(argv[i]) == "--seed" && i + 1 < argc) seed_hex = argv[++i];
+        std::string arg = argv[i];
+        if (arg == "--seed" && i + 1 < argc) seed_hex = argv[++i];
+        else if (arg == "--commit") commit_mode = true;
+        else if (arg == "--benchmark") benchmark_mode = true;
+        else if (arg == "--polys" && i + 1 < argc) polys = std::stoul(argv[++i]);
+        else if (arg == "--log-n" && i + 1 < argc) log_n = std::stoi(argv[++i]);
+        else if (arg == "--log-blowup" && i + 1 < argc) log_blowup = std::stoi(argv[++i]);
+        else if (arg == "--queries" && i + 1 < argc) queries = std::stoi(argv[++i]);
+    }
+
+    // BabyBear has 2-adicity 27
+    if (commit_mode && (log_n < 0 || log_blowup < 0 || log_n + log_blowup > 27 ||
+                        log_n + log_blowup < 1 || polys == 0)) {
+        std::cerr << "[!] Error: need polys >= 1, log-n >= 0, log-blowup >= 0 and 1 <= log-n + log-blowup <= 27"
+                  << std::endl;
+        return 1;
+    }
+
+    if (commit_mode && benchmark_mode) {
+        // Throughput sweep over polynomial sizes, always ending at --log-n itself
+        std::cerr << "[*] Commitment benchmark: " << polys << " polys, blowup " << (1 << log_blowup) << std::endl;
+        int status = 0;
+        for (int ln = std::min(10, log_n); ln < log_n; ln += 2) {
+            if (ln + log_blowup < 1) continue;
+            status |= run_commitment(seed_hex, polys, ln, log_blowup, queries, false);
+        }
+        status |= run_commitment(seed_hex, polys, log_n, log_blowup, queries, false);
+        return status;
+    }
+
+    if (commit_mode) {
+        std::cerr << "[*] Sub-Track B: Committing " << polys << " polys of 2^" << log_n
+                  << " coefficients (LDE blowup " << (1 << log_blowup) << ") via NTT -> Merkle..." << std::endl;
+        return run_commitment(seed_hex, polys, log_n, log_blowup, queries, true);
     }
 
     const int N = 1 << 20; // 262,144 * 4 = 1 Million elements